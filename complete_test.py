@@ -8,49 +8,228 @@ import socket
 import subprocess
 import time
 import os
+import re
+import signal
 import tempfile
 import threading
-import shutil
-from typing import Dict, List, Tuple
+import selectors
+import sys
+import functools
+import glob
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-# Color codes for output
-class Colors:
-    RESET = '\033[0m'
-    BOLD = '\033[1m'
-    
-    # Tester colors (blue theme)
-    TESTER = '\033[94m'      # Blue
-    TESTER_BOLD = '\033[1;94m'  # Bold Blue
-    
-    # Program colors (green theme)
-    PROGRAM = '\033[92m'     # Green
-    PROGRAM_BOLD = '\033[1;92m'  # Bold Green
-    
-    # HTTP colors
-    REQUEST = '\033[96m'     # Cyan
-    RESPONSE = '\033[93m'    # Yellow
-    
-    # Status colors
-    SUCCESS = '\033[92m'     # Green
-    ERROR = '\033[91m'       # Red
-    INFO = '\033[95m'        # Magenta
+# Color codes for output, bound once at module level
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+# Tester colors (blue theme)
+TESTER = '\033[94m'      # Blue
+TESTER_BOLD = '\033[1;94m'  # Bold Blue
+
+# Program colors (green theme)
+PROGRAM = '\033[92m'     # Green
+PROGRAM_BOLD = '\033[1;92m'  # Bold Green
+
+# HTTP colors
+REQUEST = '\033[96m'     # Cyan
+RESPONSE = '\033[93m'    # Yellow
+
+# Status colors
+SUCCESS = '\033[92m'     # Green
+ERROR = '\033[91m'       # Red
+INFO = '\033[95m'        # Magenta
+
+# Precomputed byte templates: one %-format and one write per colored line
+RESET_B = RESET.encode()
+_TESTER = TESTER.encode() + b"%b" + RESET_B + b"\n"
+_TESTER_BOLD = TESTER_BOLD.encode() + b"%b" + RESET_B + b"\n"
+_PROGRAM = PROGRAM.encode() + b"%b" + RESET_B + b"\n"
+_REQUEST = REQUEST.encode() + b"> %b" + RESET_B + b"\n"
+_RESPONSE = RESPONSE.encode() + b"< %b" + RESET_B + b"\n"
+_SUCCESS = SUCCESS.encode() + b"%b" + RESET_B + b"\n"
+_ERROR = ERROR.encode() + b"%b" + RESET_B + b"\n"
+_INFO = INFO.encode() + b"%b" + RESET_B + b"\n"
+_PLAIN = b"%b\n"
+PASS_B = f"{SUCCESS}✅ PASS{RESET} ".encode()
+FAIL_B = f"{ERROR}❌ FAIL{RESET} ".encode()
+
+# Per-thread line buffer, set while a test's output is being captured
+_captured = threading.local()
+# Serializes direct writes so lines from different threads never interleave mid-line
+_stdout_lock = threading.Lock()
+
+def _write(line: bytes):
+    """Send an encoded line to stdout, or buffer it if this thread is capturing output"""
+    lines = getattr(_captured, "lines", None)
+    if lines is None:
+        with _stdout_lock:
+            sys.stdout.buffer.write(line)
+    else:
+        lines.append(line)
+
+def emit(template: bytes, message: str = ""):
+    """Write one line built from a precomputed template"""
+    _write(template % message.encode())
+
+@functools.lru_cache(maxsize=None)
+def _tester_prefix(tag: str) -> bytes:
+    return f"{TESTER}[tester::#{tag}] ".encode()
+
+def log_tester(tag: str, message: str):
+    """Write a '[tester::#TAG] message' line using a cached, pre-encoded prefix"""
+    _write(_tester_prefix(tag) + message.encode() + RESET_B + b"\n")
+
+@contextmanager
+def captured_output():
+    """Collect everything emitted on the current thread so it can be written in one go"""
+    _captured.lines = lines = []
+    try:
+        yield lines
+    finally:
+        _captured.lines = None
+
+@contextmanager
+def phase_output():
+    """Buffer a phase's lines and hand them to stdout as one write, flushed once"""
+    try:
+        with captured_output() as lines:
+            yield lines
+    finally:
+        # Written even if the phase raised: those lines are what explains the failure
+        with _stdout_lock:
+            sys.stdout.buffer.write(b"".join(lines))
+            sys.stdout.buffer.flush()
 
 class TestResult:
+    __slots__ = ('name', 'passed', 'message')
+    
     def __init__(self, name: str, passed: bool, message: str = ""):
         self.name = name
         self.passed = passed
         self.message = message
 
+# Response parsing runs as C-level regex scans over the raw bytes
+_STATUS_RE = re.compile(rb'^HTTP/1\.[01] (\d{3})')
+_HEADER_RE = re.compile(rb'^([^:\r\n]+):[ \t]*([^\r\n]*)', re.M)
+
+# response_length results that aren't lengths
+NEED_MORE = -1
+MALFORMED = -2  # Can't be framed, e.g. a Content-Length that isn't a number; the connection is unusable
+
+def response_length(buf: bytearray, start: int, end: int) -> int:
+    """Length of the complete HTTP response at buf[start:end], NEED_MORE, or MALFORMED"""
+    header_end = buf.find(b"\r\n\r\n", start, end)
+    if header_end == -1:
+        return NEED_MORE
+    
+    content_length = None
+    close_delimited = False
+    for line in bytes(buf[start:header_end]).split(b"\r\n")[1:]:
+        key, _, value = line.partition(b":")
+        key = key.strip().lower()
+        if key == b"content-length":
+            value = value.strip()
+            if not value.isdigit():
+                return MALFORMED
+            content_length = int(value)
+        elif key == b"connection" and value.strip().lower() == b"close":
+            close_delimited = True
+    
+    if content_length is None:
+        if close_delimited:
+            return NEED_MORE  # Body runs until the server closes the connection
+        content_length = 0
+    
+    length = header_end + 4 + content_length - start
+    return length if start + length <= end else NEED_MORE
+
+SOCKET_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+def tune_socket(sock: socket.socket):
+    """Widen kernel buffers so larger responses drain in one recv, and disable Nagle"""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    if hasattr(socket, 'TCP_NODELAY'):
+        # Small requests go out immediately rather than waiting on Nagle + delayed ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+_EMPTY_HEADERS = b""
+
+@functools.lru_cache(maxsize=128)
+def _encode_headers(items: Tuple[Tuple[str, str], ...]) -> bytes:
+    """Encode a header block once per distinct set of headers, preserving their order"""
+    return b"".join(f"{key}: {value}\r\n".encode() for key, value in items)
+
 class HttpClient:
+    RECV_BUFFER_SIZE = 65536
+    # A response still incomplete at this size fails its test instead of growing the buffer forever
+    MAX_RESPONSE_SIZE = 16 << 20
+    
+    # Idle keep-alive sockets shared by all clients, keyed by (host, port)
+    _pool: Dict[Tuple[str, int], List[socket.socket]] = {}
+    _pool_lock = threading.Lock()
+    
     def __init__(self, host='localhost', port=4221):
         self.host = host
         self.port = port
         self.sock = None
         self.connected = False
+        self._host_line = f"Host: {host}:{port}\r\n".encode()
+        # One receive buffer per client, filled with recv_into instead of allocating per recv
+        self._recv_buf = bytearray(self.RECV_BUFFER_SIZE)
+        self._recv_mv = memoryview(self._recv_buf)
     
-    def connect(self) -> bool:
+    @staticmethod
+    def _is_healthy(sock: socket.socket) -> bool:
+        """An idle socket is reusable only if the peer hasn't closed it and nothing is pending"""
+        # A socket with a timeout polls before recv(), so switch it to non-blocking for the peek
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.settimeout(timeout)
+        return False
+    
+    @classmethod
+    def clear_pool(cls):
+        """Close every idle socket, e.g. once the server they point at is stopped"""
+        with cls._pool_lock:
+            idle = [sock for socks in cls._pool.values() for sock in socks]
+            cls._pool.clear()
+        for sock in idle:
+            sock.close()
+    
+    def _acquire(self):
+        """Pop a healthy idle socket for this host/port from the pool, if any"""
+        key = (self.host, self.port)
+        while True:
+            with self._pool_lock:
+                idle = self._pool.get(key)
+                if not idle:
+                    return None
+                sock = idle.pop()
+            if self._is_healthy(sock):
+                return sock
+            sock.close()
+    
+    def connect(self, fresh: bool = False) -> bool:
+        """Take an idle pooled socket if there is one, unless `fresh` asks for a new connection"""
+        pooled = None if fresh else self._acquire()
+        if pooled is not None:
+            self.sock = pooled
+            self.connected = True
+            return True
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            tune_socket(self.sock)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.sock.settimeout(5)  # 5 second timeout
             self.sock.connect((self.host, self.port))
             self.connected = True
@@ -58,227 +237,516 @@ class HttpClient:
         except Exception as e:
             return False
     
+    def release(self):
+        """Return the connection to the pool instead of closing it"""
+        if not self.sock:
+            return
+        if self.connected and self._is_healthy(self.sock):
+            with self._pool_lock:
+                self._pool.setdefault((self.host, self.port), []).append(self.sock)
+        else:
+            self.sock.close()
+        self.sock = None
+        self.connected = False
+    
     def close(self):
         if self.sock:
             self.sock.close()
             self.connected = False
     
-    def send_raw_request(self, request: str, verbose: bool = False) -> str:
+    def send_raw_request(self, request: Union[str, bytes], verbose: bool = False, body: Union[str, bytes] = b"") -> bytes:
+        """Send a request head (str or bytes) and an optional body in a separate write"""
         if not self.connected:
-            return ""
+            return b""
         
         try:
+            if isinstance(request, str):
+                request = request.encode()
+            if isinstance(body, str):
+                body = body.encode()
             if verbose:
-                print(f"{Colors.INFO}Sent bytes: {repr(request)}{Colors.RESET}")
-            self.sock.send(request.encode())
-            response = self.sock.recv(4096).decode()
+                emit(_INFO, f"Sent bytes: {repr((request + body).decode(errors='replace'))}")
+            self.sock.sendall(request)
+            if body:
+                # Sent on its own so the body is never copied into the head buffer
+                self.sock.sendall(body)
+            responses = self.recv_responses(1)
+            response = responses[0] if responses else b""
             if verbose:
-                print(f"{Colors.INFO}Received bytes: {repr(response)}{Colors.RESET}")
+                emit(_INFO, f"Received bytes: {repr(response.decode(errors='replace'))}")
             return response
         except Exception:
-            return ""
+            return b""
+    
+    def recv_responses(self, count: int) -> List[bytes]:
+        """Drain `count` responses, framing each by its Content-Length, however they were coalesced"""
+        responses = []
+        start = filled = 0
+        while len(responses) < count:
+            length = response_length(self._recv_buf, start, filled)
+            if length == MALFORMED:
+                # Nothing after this point can be framed, so the connection can't be reused either
+                self.close()
+                break
+            if length != NEED_MORE:
+                responses.append(bytes(self._recv_mv[start:start + length]))
+                start += length
+                continue
+            
+            if filled == len(self._recv_buf):
+                if start > 0:
+                    # Slide the partial response to the front to make room; copied out first
+                    # because the two ranges overlap whenever it's longer than `start`
+                    self._recv_buf[:filled - start] = bytes(self._recv_mv[start:filled])
+                    filled -= start
+                    start = 0
+                elif filled >= self.MAX_RESPONSE_SIZE:
+                    emit(_ERROR, f"Response exceeds {self.MAX_RESPONSE_SIZE} bytes; giving up on this connection")
+                    self.close()
+                    break
+                else:
+                    self._grow_recv_buf()
+            
+            received = self.sock.recv_into(self._recv_mv[filled:])
+            if not received:
+                # Peer closed: whatever is left is a close-delimited response
+                if filled > start:
+                    responses.append(bytes(self._recv_mv[start:filled]))
+                break
+            filled += received
+        return responses
     
-    def send_request(self, method: str, path: str, headers: Dict[str, str] = None, body: str = "", verbose: bool = False) -> str:
+    def _grow_recv_buf(self):
+        """Double the receive buffer so a response larger than it is never truncated"""
+        self._recv_mv.release()
+        self._recv_buf.extend(bytes(len(self._recv_buf)))
+        self._recv_mv = memoryview(self._recv_buf)
+    
+    def _build_request_head(self, method: str, path: str, headers: Dict[str, str], content_length: int) -> bytearray:
+        """Serialize the request line and headers, up to and including the blank line"""
+        buf = bytearray()
+        buf += method.encode()
+        buf += b' '
+        buf += path.encode()
+        buf += b' HTTP/1.1\r\n'
+        buf += self._host_line
+        buf += _encode_headers(tuple(headers.items())) if headers else _EMPTY_HEADERS
+        
+        if content_length:
+            buf += b'Content-Length: '
+            buf += str(content_length).encode()
+            buf += b'\r\n'
+        
+        buf += b'\r\n'
+        return buf
+    
+    @staticmethod
+    def _print_request(head: bytearray, body: bytes):
+        """Print a request in CodeCrafters format"""
+        for line in head.decode().split("\r\n"):
+            if line:
+                emit(_REQUEST, line)
+        if body:
+            emit(_REQUEST)
+            emit(_REQUEST, body.decode(errors='replace'))
+        emit(_REQUEST)
+    
+    def send_request(self, method: str, path: str, headers: Dict[str, str] = None, body: Union[str, bytes] = "", verbose: bool = False) -> bytes:
         if headers is None:
             headers = {}
         
-        # Build request
-        request_lines = [f"{method} {path} HTTP/1.1"]
-        request_lines.append(f"Host: {self.host}:{self.port}")
-        
-        for key, value in headers.items():
-            request_lines.append(f"{key}: {value}")
+        # Encode once: Content-Length must count bytes, not code points
+        body_bytes = body.encode() if isinstance(body, str) else body
         
-        if body:
-            request_lines.append(f"Content-Length: {len(body)}")
+        # Build request
+        head = self._build_request_head(method, path, headers, len(body_bytes))
         
-        request_lines.append("")  # Empty line
-        if body:
-            request_lines.append(body)
+        if verbose:
+            self._print_request(head, body_bytes)
         
-        request = "\r\n".join(request_lines)
-        if not body:
-            request += "\r\n"
+        return self.send_raw_request(head, verbose, body_bytes)
+    
+    def write_requests(self, requests: List[Tuple[str, str, Dict[str, str], Union[str, bytes]]], verbose: bool = False):
+        """Serialize all requests into one buffer and send it in a single write, without reading"""
+        payload = bytearray()
+        for method, path, headers, body in requests:
+            body_bytes = body.encode() if isinstance(body, str) else body
+            head = self._build_request_head(method, path, headers or {}, len(body_bytes))
+            if verbose:
+                self._print_request(head, body_bytes)
+            payload += head
+            payload += body_bytes
+        self.sock.sendall(payload)
+    
+    def send_pipelined(self, requests: List[Tuple[str, str, Dict[str, str], Union[str, bytes]]]) -> List[bytes]:
+        """Send all requests in one write, then read back one response per request in order"""
+        if not self.connected:
+            return []
         
-        if verbose:
-            # Print request in CodeCrafters format
-            for line in request_lines[:-1]:  # Don't print the empty line
-                if line:
-                    print(f"{Colors.REQUEST}> {line}{Colors.RESET}")
-            if body:
-                print(f"{Colors.REQUEST}> {Colors.RESET}")
-                print(f"{Colors.REQUEST}> {body}{Colors.RESET}")
-            print(f"{Colors.REQUEST}> {Colors.RESET}")
+        try:
+            self.write_requests(requests)
+            return self.recv_responses(len(requests))
+        except Exception:
+            return []
+
+SERVER_BINARY = "./build/server"
+SERVER_MAX_HEADER_SIZE = 8192  # MAX_HEADER_SIZE in src/http-server.cpp
+
+def build_if_stale() -> bool:
+    """Rebuild ./build/server only when a source file is newer than the binary"""
+    sources = glob.glob("src/**/*.[ch]pp", recursive=True) + ["CMakeLists.txt"]
+    src_mtime = max((os.stat(path).st_mtime for path in sources if os.path.exists(path)), default=0)
+    try:
+        bin_mtime = os.stat(SERVER_BINARY).st_mtime
+    except FileNotFoundError:
+        bin_mtime = 0
+    if src_mtime <= bin_mtime:
+        return True
+    sys.stdout.buffer.flush()  # cmake writes straight to the same fd
+    # No intermediate shell, and compile translation units in parallel
+    result = subprocess.run(["cmake", "--build", "./build", "--parallel", str(os.cpu_count() or 1)])
+    return result.returncode == 0
+
+class ServerFixture:
+    """Runs ./build/server once for a whole test session; usable as a context manager"""
+    
+    def __init__(self, directory: Optional[str] = None, host='localhost', port=4221):
+        self.directory = directory
+        self.host = host
+        self.port = port
+        self.process = None
+    
+    def __enter__(self) -> 'ServerFixture':
+        if not self.start():
+            raise RuntimeError(f"Server never came up on port {self.port}")
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def start(self) -> bool:
+        """Start the server and return once it accepts connections"""
+        cmd = [SERVER_BINARY]
+        if self.directory:
+            cmd.extend(["--directory", self.directory])
+        if self._port_open():
+            return False  # Someone else is listening; our server would only fail to bind
         
-        return self.send_raw_request(request, verbose)
+        try:
+            # Server output is never read, so discard it rather than let a full pipe block the server.
+            # A new session puts the server and anything it spawns in its own process group.
+            self.process = subprocess.Popen(
+                cmd, 
+                stdout=subprocess.DEVNULL, 
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except Exception:
+            return False
+        if self._wait_until_ready():
+            return True
+        # Don't leave a half-started server orphaned in its own session, holding the port
+        self.stop()
+        return False
+    
+    def _wait_until_ready(self, timeout: float = 5.0) -> bool:
+        """Poll the port with exponential backoff instead of sleeping a fixed amount"""
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                return False  # Exited, e.g. on a bind failure
+            if self._port_open():
+                return True
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        return False
+    
+    def _port_open(self) -> bool:
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            return probe.connect_ex((self.host, self.port)) == 0
+        finally:
+            probe.close()
+    
+    def stop(self):
+        """Stop the server and drop pooled connections to it"""
+        if self.process:
+            self._signal_group(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._signal_group(signal.SIGKILL)
+                self.process.wait()
+            self.process = None
+        HttpClient.clear_pool()
+    
+    def _signal_group(self, sig: int):
+        # start_new_session made the server its group's leader, so the group id is its pid.
+        # getpgid() isn't safe here: once poll() has reaped the server its pid may be recycled.
+        try:
+            os.killpg(self.process.pid, sig)
+        except ProcessLookupError:
+            pass  # Server exited and left no group members behind
+    
+    def restart(self) -> bool:
+        """Give a test that needs it a freshly started server"""
+        self.stop()
+        return self.start()
 
 class ServerTester:
-    def __init__(self):
-        self.server_process = None
+    def __init__(self, server: Optional[ServerFixture] = None):
+        # An injected server is owned by the caller: reused if running, never stopped here
+        self.server = server
+        self._owns_server = server is None
         self.test_dir = None
+        self._owns_test_dir = False
         self.results: List[TestResult] = []
+        # Tallied as results are added, so the summary never rescans them
+        self._passed = 0
+        self._failed = 0
         self.verbose = True
     
     def setup(self) -> bool:
         """Build server and create test directory"""
-        print("🔨 Building server...")
-        result = os.system("cmake --build ./build")
-        if result != 0:
-            print("❌ Build failed!")
+        emit(_PLAIN, "🔨 Building server...")
+        if not build_if_stale():
+            emit(_PLAIN, "❌ Build failed!")
             return False
         
-        # Create test directory
-        self.test_dir = tempfile.mkdtemp(prefix="http_test_")
-        print(f"📁 Test directory: {self.test_dir}")
+        # Create test directory, unless the injected server already serves one
+        if self.server and self.server.directory:
+            self.test_dir = self.server.directory
+        else:
+            self.test_dir = tempfile.mkdtemp(prefix="http_test_")
+            self._owns_test_dir = True
+        emit(_PLAIN, f"📁 Test directory: {self.test_dir}")
         return True
     
     def cleanup(self):
         """Clean up resources"""
         self.stop_server()
-        if self.test_dir and os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        if self._owns_test_dir and os.path.exists(self.test_dir):
+            # Tests only create flat files, so unlink them in one pass instead of rmtree
+            with os.scandir(self.test_dir) as entries:
+                for entry in entries:
+                    os.unlink(entry.path)
+            os.rmdir(self.test_dir)
     
-    def start_server(self, with_directory: bool = False) -> bool:
-        """Start the HTTP server"""
-        cmd = ["./build/server"]
-        if with_directory:
-            cmd.extend(["--directory", self.test_dir])
-        
-        try:
-            self.server_process = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
-            time.sleep(0.5)  # Give server time to start
+    def start_server(self) -> bool:
+        """Start the HTTP server, serving files from the test directory"""
+        if self.server is None:
+            self.server = ServerFixture(directory=self.test_dir)
+        if self.server.process is not None or self.server.start():
             return True
-        except Exception:
-            return False
+        emit(_ERROR, "Server did not start listening on port 4221 (port busy, early exit, or 5s timeout)")
+        return False
     
     def stop_server(self):
         """Stop the HTTP server"""
-        if self.server_process:
-            self.server_process.terminate()
-            self.server_process.wait()
-            self.server_process = None
+        if self.server and self._owns_server:
+            self.server.stop()
     
     def add_result(self, name: str, passed: bool, message: str = ""):
         """Add test result"""
         self.results.append(TestResult(name, passed, message))
         if passed:
-            print(f"{Colors.SUCCESS}Test passed.{Colors.RESET}")
+            self._passed += 1
+            emit(_SUCCESS, "Test passed.")
         else:
-            print(f"{Colors.ERROR}Test failed.{Colors.RESET}")
+            self._failed += 1
+            emit(_ERROR, "Test failed.")
         if message and not passed:
-            print(f"{Colors.ERROR}   {message}{Colors.RESET}")
+            emit(_ERROR, f"   {message}")
+        sys.stdout.buffer.flush()
+    
+    def file_has_content(self, filename: str, content: str) -> bool:
+        """Check a file in the test directory with a single stat, reading it only if the size matches"""
+        filepath = os.path.join(self.test_dir, filename)
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            return False
+        
+        expected = content.encode()
+        if st.st_size != len(expected):
+            return False
+        if not expected:
+            return True
+        with open(filepath, 'rb') as f:
+            return f.read() == expected
+    
+    def checkout_client(self, client: Optional[HttpClient]) -> Tuple[Optional[HttpClient], bool]:
+        """Use the group's shared client if one is given, otherwise connect a client the test owns"""
+        if client is not None:
+            return client, False
+        client = HttpClient()
+        return (client, True) if client.connect() else (None, True)
+    
+    @staticmethod
+    def checkin_client(client: HttpClient, owned: bool):
+        """Release a client the test opened itself; a shared client stays open for the next test"""
+        if owned:
+            client.release()
     
-    def parse_response(self, response: str, verbose: bool = False) -> Tuple[int, Dict[str, str], str]:
+    def report(self, tag: str, description: str, name: str, passed: bool, output: bytes):
+        """Write a test's banner and captured output in one write, then record its result"""
+        with _stdout_lock:
+            sys.stdout.buffer.write(_tester_prefix(tag) + description.encode() + RESET_B + b"\n" + output)
+        self.add_result(name, passed)
+    
+    def run_sequential(self, tag: str, tests: List[Tuple[str, str, Callable[..., bool]]]):
+        """Run tests one after another, each on its own connection"""
+        for description, name, test in tests:
+            with captured_output() as lines:
+                passed = test()
+            self.report(tag, description, name, passed, b"".join(lines))
+    
+    def run_parallel(self, groups: List[Tuple[str, str, List[Tuple[str, str, Callable[..., bool]]]]]):
+        """Run the tests of several independent groups on one thread pool, reporting in listed order
+        
+        Each worker thread keeps one keep-alive client and passes it to every test it runs,
+        so the whole phase costs one handshake per worker rather than one per test.
+        """
+        worker = threading.local()
+        group_clients: List[HttpClient] = []
+        
+        def run(test: Tuple[str, str, Callable[..., bool]]) -> Tuple[bool, bytes]:
+            # Nothing a worker does reaches stdout directly; the main thread reports it in order
+            with captured_output() as lines:
+                client = getattr(worker, "client", None)
+                if client is None:
+                    client = HttpClient()
+                    if client.connect():
+                        worker.client = client
+                        group_clients.append(client)
+                    else:
+                        client = None
+                passed = test[2](client=client)
+            if not passed and client is not None:
+                # Don't hand a connection in an unknown state to the next test
+                client.close()
+                worker.client = None
+            return passed, b"".join(lines)
+        
+        tests = [test for _, _, group_tests in groups for test in group_tests]
+        try:
+            with ThreadPoolExecutor(max_workers=min(8, len(tests))) as executor:
+                outcomes = executor.map(run, tests)
+                for tag, title, group_tests in groups:
+                    emit(_TESTER_BOLD, f"\n[tester::#{tag}] {title}")
+                    for (description, name, _), (passed, output) in zip(group_tests, outcomes):
+                        self.report(tag, description, name, passed, output)
+        finally:
+            for client in group_clients:
+                client.release()
+    
+    def parse_response(self, response: bytes, verbose: bool = False) -> Tuple[int, Dict[str, str], str]:
         """Parse HTTP response into status, headers, body"""
         if not response:
             return 0, {}, ""
         
-        parts = response.split('\r\n\r\n', 1)
-        if len(parts) < 1:
-            return 0, {}, ""
-        
-        header_section = parts[0]
-        body = parts[1] if len(parts) > 1 else ""
-        
-        lines = header_section.split('\r\n')
-        if not lines:
-            return 0, {}, body
+        header_section, _, body_bytes = response.partition(b'\r\n\r\n')
+        # Whatever the server sends, a bad byte fails the comparison rather than the whole run
+        body = body_bytes.decode(errors='replace')
         
         if verbose:
             # Print response in CodeCrafters format
-            for line in lines:
-                print(f"{Colors.RESPONSE}< {line}{Colors.RESET}")
+            for line in header_section.decode(errors='replace').split('\r\n'):
+                emit(_RESPONSE, line)
             if body:
-                print(f"{Colors.RESPONSE}< {Colors.RESET}")
-                print(f"{Colors.RESPONSE}< {body}{Colors.RESET}")
-                print(f"{Colors.RESPONSE}< {Colors.RESET}")
+                emit(_RESPONSE)
+                emit(_RESPONSE, body)
+                emit(_RESPONSE)
         
         # Parse status
-        status_line = lines[0]
-        try:
-            status_code = int(status_line.split(' ')[1])
-        except (IndexError, ValueError):
-            status_code = 0
+        status_match = _STATUS_RE.match(header_section)
+        status_code = int(status_match.group(1)) if status_match else 0
         
-        # Parse headers
-        headers = {}
-        for line in lines[1:]:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                headers[key.strip().lower()] = value.strip()
+        # Parse headers in one scan past the status line
+        headers_start = status_match.end() if status_match else 0
+        headers = {key.strip().lower().decode(errors='replace'): value.decode(errors='replace').strip()
+                   for key, value in _HEADER_RE.findall(header_section, headers_start)}
         
         if verbose:
-            print(f"{Colors.INFO}Received response with {status_code} status code{Colors.RESET}")
+            emit(_INFO, f"Received response with {status_code} status code")
         
         return status_code, headers, body
     
+    @staticmethod
+    def status_and_body(response: bytes) -> Tuple[int, bytes]:
+        """Status code and raw body for quiet checks that need neither headers nor decoding"""
+        status_match = _STATUS_RE.match(response)
+        _, _, body = response.partition(b'\r\n\r\n')
+        return (int(status_match.group(1)) if status_match else 0), body
+    
     # ==================== BASIC FUNCTIONALITY TESTS ====================
     
-    def test_server_binding(self) -> bool:
-        """Test that server binds to port 4221"""
+    def test_server_binding(self, client: Optional[HttpClient] = None) -> bool:
+        """Test that server binds to port 4221
+
+        Dials a new connection rather than a pooled one, so success means the server accepted it.
+        A shared client is ignored.
+        """
         client = HttpClient()
-        success = client.connect()
+        success = client.connect(fresh=True)
         client.close()
         if not success:
-            print(f"{Colors.ERROR}Failed to connect to server - server may not be running{Colors.RESET}")
+            emit(_ERROR, "Failed to connect to server - server may not be running")
         return success
     
-    def test_root_endpoint(self) -> bool:
+    def test_root_endpoint(self, client: Optional[HttpClient] = None) -> bool:
         """Test GET / returns 200 OK"""
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl -v http://localhost:4221/{Colors.RESET}")
+        emit(_TESTER, "Connected to localhost port 4221")
+        emit(_TESTER, "$ curl -v http://localhost:4221/")
         
-        client = HttpClient()
-        if not client.connect():
-            print(f"{Colors.ERROR}Failed to connect to server{Colors.RESET}")
+        client, owned = self.checkout_client(client)
+        if client is None:
+            emit(_ERROR, "Failed to connect to server")
             return False
         
         response = client.send_request("GET", "/", verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, headers, body = self.parse_response(response, verbose=self.verbose)
         
         if status == 200:
-            print(f"{Colors.SUCCESS}✓ Received response with 200 status code{Colors.RESET}")
+            emit(_SUCCESS, "✓ Received response with 200 status code")
         else:
-            print(f"{Colors.ERROR}Expected 200 but got {status}{Colors.RESET}")
+            emit(_ERROR, f"Expected 200 but got {status}")
         
         return status == 200
     
-    def test_404_response(self) -> bool:
+    def test_404_response(self, client: Optional[HttpClient] = None) -> bool:
         """Test unknown paths return 404"""
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl -v http://localhost:4221/pineapple{Colors.RESET}")
+        emit(_TESTER, "Connected to localhost port 4221")
+        emit(_TESTER, "$ curl -v http://localhost:4221/pineapple")
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         response = client.send_request("GET", "/pineapple", verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, headers, body = self.parse_response(response, verbose=self.verbose)
         
         if status == 404:
-            print(f"{Colors.SUCCESS}✓ Received response with 404 status code{Colors.RESET}")
+            emit(_SUCCESS, "✓ Received response with 404 status code")
         
         return status == 404
     
-    def test_echo_endpoint(self) -> bool:
+    def test_echo_endpoint(self, client: Optional[HttpClient] = None) -> bool:
         """Test /echo/* endpoint echoes back the text"""
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl -v http://localhost:4221/echo/raspberry{Colors.RESET}")
+        emit(_TESTER, "Connected to localhost port 4221")
+        emit(_TESTER, "$ curl -v http://localhost:4221/echo/raspberry")
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         response = client.send_request("GET", "/echo/raspberry", verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, headers, body = self.parse_response(response, verbose=self.verbose)
         
@@ -286,24 +754,24 @@ class ServerTester:
                   'content-type' in headers and 'content-length' in headers)
         
         if success:
-            print(f"{Colors.SUCCESS}✓ Content-Type header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Content-Length header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Body is correct{Colors.RESET}")
+            emit(_SUCCESS, "✓ Content-Type header is present")
+            emit(_SUCCESS, "✓ Content-Length header is present")
+            emit(_SUCCESS, "✓ Body is correct")
         
         return success
     
-    def test_user_agent_endpoint(self) -> bool:
+    def test_user_agent_endpoint(self, client: Optional[HttpClient] = None) -> bool:
         """Test /user-agent endpoint returns User-Agent header"""
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl -v http://localhost:4221/user-agent -H \"User-Agent: blueberry/grape-pineapple\"{Colors.RESET}")
+        emit(_TESTER, "Connected to localhost port 4221")
+        emit(_TESTER, "$ curl -v http://localhost:4221/user-agent -H \"User-Agent: blueberry/grape-pineapple\"")
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         headers = {"User-Agent": "blueberry/grape-pineapple"}
         response = client.send_request("GET", "/user-agent", headers, verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, resp_headers, body = self.parse_response(response, verbose=self.verbose)
         
@@ -311,38 +779,38 @@ class ServerTester:
                   'content-type' in resp_headers and 'content-length' in resp_headers)
         
         if success:
-            print(f"{Colors.SUCCESS}✓ Content-Type header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Content-Length header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Body is correct{Colors.RESET}")
+            emit(_SUCCESS, "✓ Content-Type header is present")
+            emit(_SUCCESS, "✓ Content-Length header is present")
+            emit(_SUCCESS, "✓ Body is correct")
         
         return success
     
     # ==================== FILE OPERATION TESTS ====================
     
-    def test_file_serving(self) -> bool:
+    def test_file_serving(self, client: Optional[HttpClient] = None) -> bool:
         """Test serving files from directory"""
-        print(f"{Colors.TESTER}Testing existing file{Colors.RESET}")
+        emit(_TESTER, "Testing existing file")
         
         # Create test file
         filename = "banana_banana_pear_banana"
         content = "raspberry blueberry strawberry mango pear strawberry mango orange"
         filepath = os.path.join(self.test_dir, filename)
         
-        print(f"{Colors.TESTER}Creating file {filename} in {self.test_dir}{Colors.RESET}")
-        print(f"{Colors.TESTER}File Content: \"{content}\"{Colors.RESET}")
+        emit(_TESTER, f"Creating file {filename} in {self.test_dir}")
+        emit(_TESTER, f"File Content: \"{content}\"")
         
         with open(filepath, 'w') as f:
             f.write(content)
         
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl -v http://localhost:4221/files/{filename}{Colors.RESET}")
+        emit(_TESTER, "Connected to localhost port 4221")
+        emit(_TESTER, f"$ curl -v http://localhost:4221/files/{filename}")
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         response = client.send_request("GET", f"/files/{filename}", verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, headers, body = self.parse_response(response, verbose=self.verbose)
         
@@ -350,119 +818,154 @@ class ServerTester:
                   headers.get('content-type') == 'application/octet-stream')
         
         if success:
-            print(f"{Colors.SUCCESS}✓ Content-Type header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Content-Length header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Body is correct{Colors.RESET}")
-            print(f"{Colors.SUCCESS}First test passed.{Colors.RESET}")
+            emit(_SUCCESS, "✓ Content-Type header is present")
+            emit(_SUCCESS, "✓ Content-Length header is present")
+            emit(_SUCCESS, "✓ Body is correct")
+            emit(_SUCCESS, "First test passed.")
         
         return success
     
-    def test_file_not_found(self) -> bool:
+    def test_file_not_found(self, client: Optional[HttpClient] = None) -> bool:
         """Test 404 for non-existent files"""
-        print(f"{Colors.TESTER}Testing non existent file returns 404{Colors.RESET}")
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl -v http://localhost:4221/files/non-existentorange_apple_strawberry_mango{Colors.RESET}")
+        emit(_TESTER, "Testing non existent file returns 404")
+        emit(_TESTER, "Connected to localhost port 4221")
+        emit(_TESTER, "$ curl -v http://localhost:4221/files/non-existentorange_apple_strawberry_mango")
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         response = client.send_request("GET", "/files/non-existentorange_apple_strawberry_mango", verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, headers, body = self.parse_response(response, verbose=self.verbose)
         
         if status == 404:
-            print(f"{Colors.SUCCESS}✓ Received response with 404 status code{Colors.RESET}")
+            emit(_SUCCESS, "✓ Received response with 404 status code")
         
         return status == 404
     
-    def test_file_creation(self) -> bool:
+    def test_file_creation(self, client: Optional[HttpClient] = None) -> bool:
         """Test creating files via POST"""
-        print(f"{Colors.TESTER}Connected to localhost port 4221{Colors.RESET}")
+        emit(_TESTER, "Connected to localhost port 4221")
         
         filename = "apple_pear_banana_pear"
         content = "mango blueberry pineapple strawberry blueberry raspberry pineapple blueberry"
         
-        print(f"{Colors.TESTER}$ curl -v -X POST http://localhost:4221/files/{filename} -H \"Content-Length: {len(content)}\" -H \"Content-Type: application/octet-stream\" -d '{content}'{Colors.RESET}")
+        emit(_TESTER, f"$ curl -v -X POST http://localhost:4221/files/{filename} -H \"Content-Length: {len(content)}\" -H \"Content-Type: application/octet-stream\" -d '{content}'")
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         headers = {"Content-Type": "application/octet-stream"}
         response = client.send_request("POST", f"/files/{filename}", headers, content, verbose=self.verbose)
-        client.close()
+        self.checkin_client(client, owned)
         
         status, _, _ = self.parse_response(response, verbose=self.verbose)
         
         if status == 201:
-            print(f"{Colors.SUCCESS}✓ Received response with 201 status code{Colors.RESET}")
+            emit(_SUCCESS, "✓ Received response with 201 status code")
             
             # Verify file was created
-            filepath = os.path.join(self.test_dir, filename)
-            print(f"{Colors.TESTER}Validating file `{filename}` exists on disk{Colors.RESET}")
-            print(f"{Colors.TESTER}Validating file `{filename}` content{Colors.RESET}")
-            
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    file_content = f.read()
-                return file_content == content
+            emit(_TESTER, f"Validating file `{filename}` exists on disk")
+            emit(_TESTER, f"Validating file `{filename}` content")
+            return self.file_has_content(filename, content)
         
-        return status == 201
+        return False
     
     # ==================== CONCURRENCY TESTS ====================
     
-    def test_concurrent_connections(self) -> bool:
-        """Test multiple simultaneous connections"""
-        print(f"{Colors.TESTER}Creating 2 parallel connections{Colors.RESET}")
-        print(f"{Colors.TESTER}Creating connection 1{Colors.RESET}")
-        print(f"{Colors.TESTER}Creating connection 2{Colors.RESET}")
-        print(f"{Colors.TESTER}Sending first set of requests{Colors.RESET}")
+    def test_concurrent_connections(self, client: Optional[HttpClient] = None, connections: int = 2) -> bool:
+        """Test multiple simultaneous connections
+
+        Every connection is newly accepted by the server, never taken from the pool.
+        A shared client is ignored.
+        """
+        emit(_TESTER, f"Creating {connections} parallel connections")
+        
+        clients = []
+        for i in range(1, connections + 1):
+            emit(_TESTER, f"Creating connection {i}")
+            client = HttpClient()
+            if not client.connect(fresh=True):
+                for opened in clients:
+                    opened.close()
+                return False
+            clients.append(client)
+        
+        # Put every request on the wire before reading any response
+        emit(_TESTER, "Sending first set of requests")
+        selector = selectors.DefaultSelector()
+        buffers = {}
+        for i, client in enumerate(clients, 1):
+            emit(_TESTER, f"client-{i}: $ curl -v http://localhost:4221/")
+            try:
+                client.write_requests([("GET", "/", None, "")])
+            except OSError:
+                selector.close()
+                for opened in clients:
+                    opened.close()
+                return False
+            client.sock.setblocking(False)
+            selector.register(client.sock, selectors.EVENT_READ, i)
+            buffers[i] = bytearray()
+        
+        # Drain whichever connection is readable until each has a complete response
+        pending = len(clients)
+        errored = set()
+        while pending:
+            events = selector.select(timeout=5)
+            if not events:
+                break
+            for key, _ in events:
+                try:
+                    chunk = key.fileobj.recv(4096)
+                except BlockingIOError:
+                    continue  # Spurious wakeup; wait for the next event
+                except OSError:
+                    # e.g. reset by the server: this connection fails, the others still count
+                    errored.add(key.data)
+                    chunk = b""
+                buf = buffers[key.data]
+                buf += chunk
+                length = response_length(buf, 0, len(buf))
+                if length == MALFORMED:
+                    errored.add(key.data)
+                if not chunk or length != NEED_MORE:
+                    selector.unregister(key.fileobj)
+                    pending -= 1
+        selector.close()
         
         results = []
+        for i, client in enumerate(clients, 1):
+            status, _, _ = self.parse_response(bytes(buffers[i]), verbose=self.verbose)
+            results.append(i not in errored and status == 200)
+            client.close()
+            emit(_TESTER, f"Closing connection {i}")
         
-        # Test client 1
-        print(f"{Colors.TESTER}client-1: $ curl -v http://localhost:4221/{Colors.RESET}")
-        client1 = HttpClient()
-        if client1.connect():
-            response1 = client1.send_request("GET", "/", verbose=self.verbose)
-            status1, _, _ = self.parse_response(response1, verbose=self.verbose)
-            results.append(status1 == 200)
-            client1.close()
-            print(f"{Colors.TESTER}Closing connection 1{Colors.RESET}")
-        else:
-            results.append(False)
-        
-        # Test client 2  
-        print(f"{Colors.TESTER}client-2: $ curl -v http://localhost:4221/{Colors.RESET}")
-        client2 = HttpClient()
-        if client2.connect():
-            response2 = client2.send_request("GET", "/", verbose=self.verbose)
-            status2, _, _ = self.parse_response(response2, verbose=self.verbose)
-            results.append(status2 == 200)
-            client2.close()
-            print(f"{Colors.TESTER}Closing connection 2{Colors.RESET}")
-        else:
-            results.append(False)
-        
-        return all(results)
+        return pending == 0 and all(results)
     
-    def test_rapid_requests(self) -> bool:
+    def test_rapid_requests(self, client: Optional[HttpClient] = None) -> bool:
         """Test rapid sequential requests"""
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         try:
-            for i in range(10):
-                response = client.send_request("GET", f"/echo/rapid{i}")
-                status, _, body = self.parse_response(response)
-                if status != 200 or body != f"rapid{i}":
+            requests = [("GET", f"/echo/rapid{i}", None, "") for i in range(10)]
+            responses = client.send_pipelined(requests)
+            if len(responses) != len(requests):
+                client.close()
+                return False
+            
+            for i, response in enumerate(responses):
+                status, body = self.status_and_body(response)
+                if status != 200 or body != b"rapid%d" % i:
                     client.close()
                     return False
             
-            client.close()
+            self.checkin_client(client, owned)
             return True
         except Exception:
             client.close()
@@ -470,48 +973,62 @@ class ServerTester:
     
     # ==================== PERSISTENT CONNECTION TESTS ====================
     
-    def test_keep_alive_connections(self) -> bool:
-        """Test persistent connections (keep-alive)"""
-        print(f"{Colors.TESTER}Creating connection{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl --http1.1 -v http://localhost:4221/user-agent -H \"User-Agent: grape/mango-pear\" --next http://localhost:4221/{Colors.RESET}")
+    def test_keep_alive_connections(self, client: Optional[HttpClient] = None) -> bool:
+        """Test persistent connections (keep-alive)
+
+        Starts from a connection that has served nothing yet, so the reuse observed is this test's own.
+        A shared client is ignored.
+        """
+        emit(_TESTER, "Creating connection")
+        emit(_TESTER, "$ curl --http1.1 -v http://localhost:4221/user-agent -H \"User-Agent: grape/mango-pear\" --next http://localhost:4221/")
         
         client = HttpClient()
-        if not client.connect():
+        if not client.connect(fresh=True):
             return False
         
         try:
-            # First request
+            # Send both requests back to back, then drain both responses together
             headers = {"User-Agent": "grape/mango-pear"}
-            response1 = client.send_request("GET", "/user-agent", headers, verbose=self.verbose)
+            client.write_requests([("GET", "/user-agent", headers, ""), ("GET", "/", None, "")], verbose=self.verbose)
+            responses = client.recv_responses(2)
+            if len(responses) != 2:
+                client.close()
+                return False
+            response1, response2 = responses
+            
+            # First response
             status1, resp_headers1, body1 = self.parse_response(response1, verbose=self.verbose)
             
             if status1 != 200 or body1 != "grape/mango-pear":
                 client.close()
                 return False
             
-            print(f"{Colors.SUCCESS}✓ Content-Type header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Content-Length header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Body is correct{Colors.RESET}")
-            print(f"{Colors.TESTER}* Re-using existing connection with host localhost{Colors.RESET}")
+            emit(_SUCCESS, "✓ Content-Type header is present")
+            emit(_SUCCESS, "✓ Content-Length header is present")
+            emit(_SUCCESS, "✓ Body is correct")
+            emit(_TESTER, "* Re-using existing connection with host localhost")
             
-            # Second request on same connection
-            response2 = client.send_request("GET", "/", verbose=self.verbose)
+            # Second response on same connection
             status2, _, body2 = self.parse_response(response2, verbose=self.verbose)
             
-            client.close()
+            client.release()
             return status2 == 200
         
         except Exception:
             client.close()
             return False
     
-    def test_connection_close(self) -> bool:
-        """Test Connection: close header"""
-        print(f"{Colors.TESTER}Creating connection{Colors.RESET}")
-        print(f"{Colors.TESTER}$ curl --http1.1 -v http://localhost:4221/ --next http://localhost:4221/user-agent -H \"Connection: close\" -H \"User-Agent: banana/mango\"{Colors.RESET}")
+    def test_connection_close(self, client: Optional[HttpClient] = None) -> bool:
+        """Test Connection: close header
+
+        Uses a connection of its own, newly opened, because the server closes it at the end.
+        A shared client is ignored.
+        """
+        emit(_TESTER, "Creating connection")
+        emit(_TESTER, "$ curl --http1.1 -v http://localhost:4221/ --next http://localhost:4221/user-agent -H \"Connection: close\" -H \"User-Agent: banana/mango\"")
         
         client = HttpClient()
-        if not client.connect():
+        if not client.connect(fresh=True):
             return False
         
         # First request (normal)
@@ -522,7 +1039,7 @@ class ServerTester:
             client.close()
             return False
         
-        print(f"{Colors.TESTER}* Connection #0 to host localhost left intact{Colors.RESET}")
+        emit(_TESTER, "* Connection #0 to host localhost left intact")
         
         # Second request with Connection: close
         headers = {"Connection": "close", "User-Agent": "banana/mango"}
@@ -534,61 +1051,53 @@ class ServerTester:
                   resp_headers.get('connection', '').lower() == 'close')
         
         if success:
-            print(f"{Colors.SUCCESS}✓ Content-Type header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Content-Length header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Connection header is present{Colors.RESET}")
-            print(f"{Colors.SUCCESS}✓ Body is correct{Colors.RESET}")
-            print(f"{Colors.TESTER}Connection #0 is closed{Colors.RESET}")
+            emit(_SUCCESS, "✓ Content-Type header is present")
+            emit(_SUCCESS, "✓ Content-Length header is present")
+            emit(_SUCCESS, "✓ Connection header is present")
+            emit(_SUCCESS, "✓ Body is correct")
+            emit(_TESTER, "Connection #0 is closed")
         
         return success
     
     # ==================== EDGE CASE TESTS ====================
     
-    def test_large_request_body(self) -> bool:
+    def test_large_request_body(self, client: Optional[HttpClient] = None) -> bool:
         """Test handling large request bodies"""
         large_content = "x" * 10000  # 10KB
         
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         headers = {"Content-Type": "application/octet-stream"}
         response = client.send_request("POST", "/files/large.txt", headers, large_content)
-        client.close()
+        self.checkin_client(client, owned)
         
-        status, _, _ = self.parse_response(response)
+        status, _ = self.status_and_body(response)
         if status != 201:
             return False
         
         # Verify file content
-        filepath = os.path.join(self.test_dir, "large.txt")
-        if not os.path.exists(filepath):
-            return False
-        
-        with open(filepath, 'r') as f:
-            file_content = f.read()
-        
-        return file_content == large_content
+        return self.file_has_content("large.txt", large_content)
     
-    def test_empty_request_body(self) -> bool:
+    def test_empty_request_body(self, client: Optional[HttpClient] = None) -> bool:
         """Test POST with empty body"""
-        client = HttpClient()
-        if not client.connect():
+        client, owned = self.checkout_client(client)
+        if client is None:
             return False
         
         headers = {"Content-Type": "application/octet-stream"}
         response = client.send_request("POST", "/files/empty.txt", headers, "")
-        client.close()
+        self.checkin_client(client, owned)
         
-        status, _, _ = self.parse_response(response)
+        status, _ = self.status_and_body(response)
         if status != 201:
             return False
         
         # Verify empty file was created
-        filepath = os.path.join(self.test_dir, "empty.txt")
-        return os.path.exists(filepath) and os.path.getsize(filepath) == 0
+        return self.file_has_content("empty.txt", "")
     
-    def test_special_characters_in_path(self) -> bool:
+    def test_special_characters_in_path(self, client: Optional[HttpClient] = None) -> bool:
         """Test paths with special characters"""
         test_paths = [
             "/echo/hello%20world",  # URL encoded space
@@ -596,173 +1105,151 @@ class ServerTester:
             "/echo/under_score",    # Underscores
         ]
         
-        for path in test_paths:
-            client = HttpClient()
-            if not client.connect():
-                return False
-            
-            response = client.send_request("GET", path)
+        client, owned = self.checkout_client(client)
+        if client is None:
+            return False
+        
+        responses = client.send_pipelined([("GET", path, None, "") for path in test_paths])
+        if len(responses) != len(test_paths):
             client.close()
-            
-            status, _, _ = self.parse_response(response)
+            return False
+        
+        for response in responses:
+            status, _ = self.status_and_body(response)
             if status != 200:
+                client.close()
                 return False
         
+        self.checkin_client(client, owned)
+        return True
+    
+    def test_oversized_header(self, client: Optional[HttpClient] = None) -> bool:
+        """Test that a header never terminated within the limit gets 431 and a closed connection
+
+        The server closes this connection, so it is opened fresh; a shared client is ignored.
+        """
+        # Exactly the limit, with no blank line: the server has read everything when it answers,
+        # so its close is a clean FIN rather than a reset that could discard the 431
+        head = b"GET / HTTP/1.1\r\nX-Filler: "
+        request = head + b"a" * (SERVER_MAX_HEADER_SIZE - len(head))
+        emit(_TESTER, f"Sending {len(request)} header bytes without a terminating blank line")
+        
+        client = HttpClient()
+        if not client.connect(fresh=True):
+            return False
+        try:
+            client.sock.sendall(request)
+            responses = client.recv_responses(1)
+            closed = client.connected and client.sock.recv(1) == b""
+        except OSError:
+            return False
+        finally:
+            client.close()
+        
+        status, _, _ = self.parse_response(responses[0] if responses else b"", verbose=self.verbose)
+        if status != 431:
+            emit(_ERROR, f"Expected status 431, got {status}")
+            return False
+        if not closed:
+            emit(_ERROR, "Connection was left open after 431")
+            return False
+        emit(_TESTER, "Connection #0 is closed")
         return True
     
     # ==================== MAIN TEST RUNNER ====================
     
     def run_all_tests(self):
         """Run the complete test suite"""
-        print(f"{Colors.INFO}[compile] Compilation successful.{Colors.RESET}\n")
+        emit(_INFO, "[compile] Compilation successful.\n")
         
         if not self.setup():
             return False
         
         try:
-            # Basic functionality tests
-            print(f"{Colors.TESTER_BOLD}[tester::#ROOT] Running tests for Basic HTTP Functionality{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#ROOT] Running program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#ROOT] $ ./build/server{Colors.RESET}")
-            
-            self.start_server()
-            print(f"{Colors.PROGRAM}[your_program] [HttpServer] Listening on port 4221{Colors.RESET}")
-            print(f"{Colors.PROGRAM}[your_program] Waiting for a client to connect...{Colors.RESET}")
-            
-            print(f"{Colors.TESTER}[tester::#ROOT] Testing basic connection{Colors.RESET}")
-            self.add_result("Server Binding", self.test_server_binding())
-            
-            print(f"{Colors.TESTER}[tester::#ROOT] Testing GET / endpoint{Colors.RESET}")
-            self.add_result("Root Endpoint (GET /)", self.test_root_endpoint())
-            
-            print(f"{Colors.TESTER}[tester::#ROOT] Testing 404 response{Colors.RESET}")
-            self.add_result("404 Response", self.test_404_response())
+            # One server, started with the test directory, serves every group below
+            with phase_output():
+                log_tester("ROOT", "Running program")
+                log_tester("ROOT", f"$ ./build/server --directory {self.test_dir}")
+                
+                if not self.start_server():
+                    return False  # Don't run the suite against whatever else holds the port
+                emit(_PROGRAM, "[your_program] [HttpServer] Listening on port 4221")
+                emit(_PROGRAM, "[your_program] Waiting for a client to connect...")
             
-            print(f"{Colors.TESTER}[tester::#ROOT] Testing echo endpoint{Colors.RESET}")
-            self.add_result("Echo Endpoint", self.test_echo_endpoint())
-            
-            print(f"{Colors.TESTER}[tester::#ROOT] Testing user-agent endpoint{Colors.RESET}")
-            self.add_result("User-Agent Endpoint", self.test_user_agent_endpoint())
-            
-            print(f"{Colors.TESTER}[tester::#ROOT] Terminating program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#ROOT] Program terminated successfully{Colors.RESET}")
-            self.stop_server()
-            
-            # File operation tests
-            print(f"\n{Colors.TESTER_BOLD}[tester::#FILE] Running tests for File Operations{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#FILE] Running program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#FILE] $ ./build/server --directory {self.test_dir}{Colors.RESET}")
-            
-            self.start_server(with_directory=True)
-            print(f"{Colors.PROGRAM}[your_program] [HttpServer] Listening on port 4221{Colors.RESET}")
-            print(f"{Colors.PROGRAM}[your_program] Waiting for a client to connect...{Colors.RESET}")
-            
-            print(f"{Colors.TESTER}[tester::#FILE] Testing file serving{Colors.RESET}")
-            self.add_result("File Serving", self.test_file_serving())
-            
-            print(f"{Colors.TESTER}[tester::#FILE] Testing file not found{Colors.RESET}")
-            self.add_result("File Not Found", self.test_file_not_found())
-            
-            print(f"{Colors.TESTER}[tester::#FILE] Testing file creation{Colors.RESET}")
-            self.add_result("File Creation", self.test_file_creation())
-            
-            print(f"{Colors.TESTER}[tester::#FILE] Testing large request body{Colors.RESET}")
-            self.add_result("Large Request Body", self.test_large_request_body())
-            
-            print(f"{Colors.TESTER}[tester::#FILE] Testing empty request body{Colors.RESET}")
-            self.add_result("Empty Request Body", self.test_empty_request_body())
-            
-            print(f"{Colors.TESTER}[tester::#FILE] Terminating program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#FILE] Program terminated successfully{Colors.RESET}")
-            self.stop_server()
-            
-            # Concurrency tests
-            print(f"\n{Colors.TESTER_BOLD}[tester::#CONC] Running tests for Concurrent Connections{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#CONC] Running program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#CONC] $ ./build/server{Colors.RESET}")
-            
-            self.start_server()
-            print(f"{Colors.PROGRAM}[your_program] [HttpServer] Listening on port 4221{Colors.RESET}")
-            print(f"{Colors.PROGRAM}[your_program] Waiting for a client to connect...{Colors.RESET}")
-            
-            print(f"{Colors.TESTER}[tester::#CONC] Creating multiple parallel connections{Colors.RESET}")
-            self.add_result("Concurrent Connections", self.test_concurrent_connections())
-            
-            print(f"{Colors.TESTER}[tester::#CONC] Testing rapid sequential requests{Colors.RESET}")
-            self.add_result("Rapid Sequential Requests", self.test_rapid_requests())
-            
-            print(f"{Colors.TESTER}[tester::#CONC] Terminating program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#CONC] Program terminated successfully{Colors.RESET}")
-            self.stop_server()
+            # Groups that don't restart the server or share files all run on one thread pool
+            self.run_parallel([
+                ("ROOT", "Running tests for Basic HTTP Functionality", [
+                    ("Testing basic connection", "Server Binding", self.test_server_binding),
+                    ("Testing GET / endpoint", "Root Endpoint (GET /)", self.test_root_endpoint),
+                    ("Testing 404 response", "404 Response", self.test_404_response),
+                    ("Testing echo endpoint", "Echo Endpoint", self.test_echo_endpoint),
+                    ("Testing user-agent endpoint", "User-Agent Endpoint", self.test_user_agent_endpoint),
+                ]),
+                # Each file test uses its own filename, so they can run side by side
+                ("FILE", "Running tests for File Operations", [
+                    ("Testing file serving", "File Serving", self.test_file_serving),
+                    ("Testing file not found", "File Not Found", self.test_file_not_found),
+                    ("Testing file creation", "File Creation", self.test_file_creation),
+                    ("Testing large request body", "Large Request Body", self.test_large_request_body),
+                    ("Testing empty request body", "Empty Request Body", self.test_empty_request_body),
+                ]),
+                ("CONC", "Running tests for Concurrent Connections", [
+                    ("Creating multiple parallel connections", "Concurrent Connections", self.test_concurrent_connections),
+                    ("Testing rapid sequential requests", "Rapid Sequential Requests", self.test_rapid_requests),
+                ]),
+                ("EDGE", "Running tests for Edge Cases", [
+                    ("Testing special characters in path", "Special Characters in Path", self.test_special_characters_in_path),
+                    ("Testing oversized request header", "Oversized Request Header", self.test_oversized_header),
+                ]),
+            ])
             
             # Persistent connection tests
-            print(f"\n{Colors.TESTER_BOLD}[tester::#PERSIST] Running tests for Persistent Connections{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#PERSIST] Running program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#PERSIST] $ ./build/server{Colors.RESET}")
-            
-            self.start_server()
-            print(f"{Colors.PROGRAM}[your_program] [HttpServer] Listening on port 4221{Colors.RESET}")
-            print(f"{Colors.PROGRAM}[your_program] Waiting for a client to connect...{Colors.RESET}")
-            
-            print(f"{Colors.TESTER}[tester::#PERSIST] Testing keep-alive connections{Colors.RESET}")
-            self.add_result("Keep-Alive Connections", self.test_keep_alive_connections())
-            
-            print(f"{Colors.TESTER}[tester::#PERSIST] Testing connection close{Colors.RESET}")
-            self.add_result("Connection Close", self.test_connection_close())
-            
-            print(f"{Colors.TESTER}[tester::#PERSIST] Terminating program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#PERSIST] Program terminated successfully{Colors.RESET}")
-            self.stop_server()
-            
-            # Edge case tests
-            print(f"\n{Colors.TESTER_BOLD}[tester::#EDGE] Running tests for Edge Cases{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#EDGE] Running program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#EDGE] $ ./build/server{Colors.RESET}")
+            emit(_TESTER_BOLD, "\n[tester::#PERSIST] Running tests for Persistent Connections")
+            # Persistent connection tests stay sequential: they reason about a single connection's lifetime
+            self.run_sequential("PERSIST", [
+                ("Testing keep-alive connections", "Keep-Alive Connections", self.test_keep_alive_connections),
+                ("Testing connection close", "Connection Close", self.test_connection_close),
+            ])
             
-            self.start_server()
-            print(f"{Colors.PROGRAM}[your_program] [HttpServer] Listening on port 4221{Colors.RESET}")
-            print(f"{Colors.PROGRAM}[your_program] Waiting for a client to connect...{Colors.RESET}")
-            
-            print(f"{Colors.TESTER}[tester::#EDGE] Testing special characters in path{Colors.RESET}")
-            self.add_result("Special Characters in Path", self.test_special_characters_in_path())
-            
-            print(f"{Colors.TESTER}[tester::#EDGE] Terminating program{Colors.RESET}")
-            print(f"{Colors.TESTER}[tester::#EDGE] Program terminated successfully{Colors.RESET}")
-            self.stop_server()
+            with phase_output():
+                log_tester("PERSIST", "Terminating program")
+                self.stop_server()
+                log_tester("PERSIST", "Program terminated successfully")
             
         finally:
             self.cleanup()
         
         # Print summary
         self.print_summary()
-        return all(result.passed for result in self.results)
+        return self._failed == 0
     
     def print_summary(self):
         """Print test results summary"""
-        passed = sum(1 for r in self.results if r.passed)
-        total = len(self.results)
-        failed = total - passed
-        
-        print(f"\n" + "=" * 50)
-        print(f"📊 TEST SUMMARY")
-        print(f"=" * 50)
-        
-        # Show individual test results
-        for result in self.results:
-            status = f"{Colors.SUCCESS}✅ PASS{Colors.RESET}" if result.passed else f"{Colors.ERROR}❌ FAIL{Colors.RESET}"
-            print(f"{status} {result.name}")
-            if result.message and not result.passed:
-                print(f"      {Colors.ERROR}{result.message}{Colors.RESET}")
-        
-        print(f"\nResults: {passed}/{total} tests passed")
-        
-        if failed == 0:
-            print(f"{Colors.SUCCESS}🎉 Test passed. Congrats!{Colors.RESET}")
-            print(f"{Colors.SUCCESS}All {total} tests completed successfully.{Colors.RESET}")
-        else:
-            print(f"{Colors.ERROR}❌ Test failed!{Colors.RESET}")
-            print(f"{Colors.ERROR}{failed} out of {total} tests failed.{Colors.RESET}")
-            print(f"{Colors.ERROR}Please check the output above for details.{Colors.RESET}")
+        passed = self._passed
+        failed = self._failed
+        total = passed + failed
+        
+        # Build the whole summary first, then issue a single write
+        with phase_output() as lines:
+            emit(_PLAIN, "\n" + "=" * 50)
+            emit(_PLAIN, "📊 TEST SUMMARY")
+            emit(_PLAIN, "=" * 50)
+            
+            # Show individual test results
+            for result in self.results:
+                lines.append((PASS_B if result.passed else FAIL_B) + result.name.encode() + b"\n")
+                if result.message and not result.passed:
+                    emit(_ERROR, f"      {result.message}")
+            
+            emit(_PLAIN, f"\nResults: {passed}/{total} tests passed")
+            
+            if failed == 0:
+                emit(_SUCCESS, "🎉 Test passed. Congrats!")
+                emit(_SUCCESS, f"All {total} tests completed successfully.")
+            else:
+                emit(_ERROR, "❌ Test failed!")
+                emit(_ERROR, f"{failed} out of {total} tests failed.")
+                emit(_ERROR, "Please check the output above for details.")
 
 def main():
     tester = ServerTester()
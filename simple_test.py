@@ -4,93 +4,75 @@ Simple HTTP Server Test Script
 Just the basics - no fancy features
 """
 
-import socket
-import subprocess
-import time
-import os
-import tempfile
+from complete_test import HttpClient, ServerFixture, build_if_stale
+
+REQ_TMPL = b'GET %s HTTP/1.1\r\nHost: localhost\r\n%s\r\n'
+
+# Fixed probes and the markers their responses must contain, encoded once at import
+REQ_ROOT = REQ_TMPL % (b'/', b'')
+REQ_ECHO = REQ_TMPL % (b'/echo/hello', b'')
+REQ_UA = REQ_TMPL % (b'/user-agent', b'User-Agent: test-client\r\n')
+REQ_404 = REQ_TMPL % (b'/nonexistent', b'Connection: close\r\n')
+
+OK = b'200 OK'
+HELLO = b'hello'
+UA = b'test-client'
+NF = b'404'
+
+def probe(*requests):
+    """Pipeline `requests` on one fresh connection and return one response per request"""
+    client = HttpClient()
+    responses = []
+    if client.connect(fresh=True):
+        try:
+            client.sock.sendall(b''.join(requests))
+            responses = client.recv_responses(len(requests))
+        finally:
+            client.close()
+    return responses + [b""] * (len(requests) - len(responses))
+
+def check(label, response, needles, ok, fail):
+    """Print a ✓/✗ line for `response`, dumping it only when a needle is missing"""
+    print(label)
+    if all(needle in response for needle in needles):
+        print(f"   ✓ {ok}")
+    else:
+        print(f"   ✗ {fail}")
+        print(f"   Response: {response.decode('latin-1', 'replace')}")
 
 def test_server():
     print("=== Simple HTTP Server Tests ===\n")
     
-    # Start server
+    # Start server once; the fixture polls the port instead of sleeping
     print("1. Starting server...")
-    server = subprocess.Popen(['./build/server'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    time.sleep(1)  # Give server time to start
-    
-    try:
-        # Test 1: Basic connection
-        print("2. Testing basic connection...")
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect(('localhost', 4221))
-        sock.send(b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
-        response = sock.recv(1024).decode()
-        sock.close()
-        
-        if '200 OK' in response:
-            print("   ✓ GET / returns 200 OK")
-        else:
-            print("   ✗ GET / failed")
-            print(f"   Response: {response}")
-        
-        # Test 2: Echo endpoint
-        print("3. Testing echo endpoint...")
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect(('localhost', 4221))
-        sock.send(b'GET /echo/hello HTTP/1.1\r\nHost: localhost\r\n\r\n')
-        response = sock.recv(1024).decode()
-        sock.close()
+    with ServerFixture():
+        try:
+            # All four probes are pipelined on one connection; the last one asks the
+            # server to close it so the responses can be drained until EOF
+            responses = probe(REQ_ROOT, REQ_ECHO, REQ_UA, REQ_404)
+            
+            check("2. Testing basic connection...", responses[0], (OK,),
+                  "GET / returns 200 OK", "GET / failed")
+            check("3. Testing echo endpoint...", responses[1], (OK, HELLO),
+                  "GET /echo/hello works", "Echo endpoint failed")
+            check("4. Testing user-agent endpoint...", responses[2], (OK, UA),
+                  "GET /user-agent works", "User-agent endpoint failed")
+            check("5. Testing 404 response...", responses[3], (NF,),
+                  "GET /nonexistent returns 404", "404 test failed")
+            
+            print("\n✓ Basic tests completed!")
+            
+        except Exception as e:
+            print(f"   ✗ Test failed: {e}")
         
-        if '200 OK' in response and 'hello' in response:
-            print("   ✓ GET /echo/hello works")
-        else:
-            print("   ✗ Echo endpoint failed")
-            print(f"   Response: {response}")
-        
-        # Test 3: User-Agent
-        print("4. Testing user-agent endpoint...")
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect(('localhost', 4221))
-        sock.send(b'GET /user-agent HTTP/1.1\r\nHost: localhost\r\nUser-Agent: test-client\r\n\r\n')
-        response = sock.recv(1024).decode()
-        sock.close()
-        
-        if '200 OK' in response and 'test-client' in response:
-            print("   ✓ GET /user-agent works")
-        else:
-            print("   ✗ User-agent endpoint failed")
-            print(f"   Response: {response}")
-        
-        # Test 4: 404
-        print("5. Testing 404 response...")
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect(('localhost', 4221))
-        sock.send(b'GET /nonexistent HTTP/1.1\r\nHost: localhost\r\n\r\n')
-        response = sock.recv(1024).decode()
-        sock.close()
-        
-        if '404' in response:
-            print("   ✓ GET /nonexistent returns 404")
-        else:
-            print("   ✗ 404 test failed")
-            print(f"   Response: {response}")
-        
-        print("\n✓ Basic tests completed!")
-        
-    except Exception as e:
-        print(f"   ✗ Test failed: {e}")
-    
-    finally:
-        # Stop server
-        print("6. Stopping server...")
-        server.terminate()
-        server.wait()
+        finally:
+            # Stop server
+            print("6. Stopping server...")
 
 if __name__ == "__main__":
     # Build first
     print("Building server...")
-    result = os.system("cmake --build ./build")
-    if result != 0:
+    if not build_if_stale():
         print("Build failed!")
         exit(1)
     
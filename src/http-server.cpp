@@ -104,18 +104,19 @@ void HttpServer::acceptConnections() {
     }
 }
 
-// This static method parses the raw HTTP request from the buffer.
-HttpRequest HttpRequest::parse(int client_fd, char* buffer, int bytes_read) {
+// This static method parses one raw HTTP request off the front of the pending buffer.
+// Any bytes past the end of the request (e.g. pipelined requests) are left in 'pending'.
+HttpRequest HttpRequest::parse(int client_fd, std::string& pending) {
     HttpRequest request;
 
-    buffer[bytes_read] = '\0'; // Null-terminate the buffer to treat it as a C-string
-    std::string raw_request(buffer);
-
     // Find the split point between headers and body
-    size_t header_end = raw_request.find("\r\n\r\n");
-    if (header_end == std::string::npos) return request;    // Return empty request if invalid.
+    size_t header_end = pending.find("\r\n\r\n");
+    if (header_end == std::string::npos) {
+        pending.clear();
+        return request;    // Return empty request if invalid.
+    }
 
-    std::string header_section = raw_request.substr(0, header_end);
+    std::string header_section = pending.substr(0, header_end);
     std::istringstream header_stream(header_section);
 
     // Parse request line
@@ -141,25 +142,26 @@ HttpRequest HttpRequest::parse(int client_fd, char* buffer, int bytes_read) {
     request.headers = headers;
 
     // Determine the length of the body from the 'Content-Length' header.
-    int content_length = 0;
+    size_t content_length = 0;
     if (headers.find("content-length") != headers.end()) {
-        content_length = std::stoi(headers["content-length"]);
+        content_length = std::stoul(headers["content-length"]);
     }
 
-    // Extract the body from the initial buffer.
-    request.body = raw_request.substr(header_end + 4);
-    int already_read = request.body.size();
-
-    // Read more if Content-Length not satisfied
-    while (already_read < content_length) {
+    // Read more if Content-Length not satisfied by what is already buffered
+    size_t body_start = header_end + 4;
+    while (pending.size() - body_start < content_length) {
         char more[4096];
         int n = recv(client_fd, more, sizeof(more), 0);  // number of bytes read from socket and copied to 'more'
         // recv -> receive data from a connected socket
         if (n <= 0) break;
-        request.body.append(more, n);
-        already_read += n;
+        pending.append(more, n);
     }
 
+    // Take exactly the body and keep whatever follows for the next request.
+    size_t body_len = std::min(content_length, pending.size() - body_start);
+    request.body = pending.substr(body_start, body_len);
+    pending.erase(0, body_start + body_len);
+
     return request;
 }
 
@@ -243,17 +245,37 @@ void RequestHandler::handle(const HttpRequest& request, HttpResponse& response)
     }
 }
 
+// Most header bytes buffered while waiting for "\r\n\r\n"; a client that never ends its header is cut off here.
+const size_t MAX_HEADER_SIZE = 8192;
+
 // This is the main function for each client-handling thread.
 void handleClient(int client_fd, const std::string& base_dir) {
     char buffer[4096];
+    std::string pending;    // Bytes received but not yet consumed; may hold several pipelined requests.
     // Loop to handle multiple requests on the same connection (keep-alive).
     while (true) {
-        int bytes_read = recv(client_fd, buffer, sizeof(buffer) - 1, 0);
-        if (bytes_read <= 0) {
-            break;  // client closed connection or error occurred
+        // Only hit the socket when no complete request header is already buffered.
+        bool peer_closed = false;
+        size_t scan_from = 0;   // Earlier bytes were already searched; the terminator may straddle the old end.
+        while (pending.find("\r\n\r\n", scan_from) == std::string::npos) {
+            if (pending.size() >= MAX_HEADER_SIZE) {
+                HttpResponse(client_fd, true).sendRaw("HTTP/1.1 431 Request Header Fields Too Large\r\nConnection: close\r\n\r\n");
+                peer_closed = true;
+                break;
+            }
+            scan_from = pending.size() >= 3 ? pending.size() - 3 : 0;
+            int bytes_read = recv(client_fd, buffer, sizeof(buffer), 0);
+            if (bytes_read <= 0) {
+                peer_closed = true;  // client closed connection or error occurred
+                break;
+            }
+            pending.append(buffer, bytes_read);
+        }
+        if (peer_closed) {
+            break;
         }
 
-        HttpRequest request = HttpRequest::parse(client_fd, buffer, bytes_read);
+        HttpRequest request = HttpRequest::parse(client_fd, pending);
         // HttpResponse response(client_fd);
 
         // Check the 'Connection' header to see if the connection should be closed after this response.
@@ -267,9 +289,6 @@ void handleClient(int client_fd, const std::string& base_dir) {
         if(should_close){
             break;
         }
-
-        // Clear buffer for next request
-        memset(buffer, 0, sizeof(buffer));
     }
 
     close(client_fd);
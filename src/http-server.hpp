@@ -64,7 +64,12 @@ public:
     std::map<std::string, std::string> headers;
     std::string body;
 
-    static HttpRequest parse(int client_fd, char* buffer, int bytes_read);
+    /**
+     * @brief Parses one request off the front of 'pending', reading the rest of the body from the socket if needed.
+     *
+     * Bytes belonging to any following (pipelined) request stay in 'pending'.
+     */
+    static HttpRequest parse(int client_fd, std::string& pending);
 };
 
 /**